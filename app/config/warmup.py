@@ -0,0 +1,82 @@
+"""
+Pre-fork warmup for the gunicorn master.
+
+Everything loaded here before workers are forked is shared between them
+copy-on-write instead of being rebuilt by each worker on its first request.
+"""
+
+import gc
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+from django.template import TemplateSyntaxError, engines
+from django.urls import get_resolver
+from django.utils import translation
+
+
+def warmup():
+    load_url_patterns()
+    compile_templates()
+    fill_model_meta()
+    load_social_providers()
+    translation.activate(settings.LANGUAGE_CODE)
+    translation.deactivate()
+
+    # Workers must open their own database connections.
+    connections.close_all()
+
+    # Move everything allocated so far out of the collector's generations so
+    # gc passes in the workers don't write to (and so copy) the shared pages.
+    gc.collect()
+    gc.freeze()
+
+
+def load_url_patterns():
+    """
+    Import every view module and build the reverse lookup tables.
+    """
+    resolver = get_resolver()
+    resolver.reverse_dict
+    resolver.namespace_dict
+    resolver.app_dict
+
+
+def compile_templates():
+    """
+    Compile every template the engines can find into the cached loader.
+    """
+    for engine in engines.all():
+        for directory in engine.template_dirs:
+            directory = Path(directory)
+            for path in directory.rglob('*'):
+                if path.suffix not in ('.html', '.txt'):
+                    continue
+                try:
+                    engine.get_template(path.relative_to(directory).as_posix())
+                except TemplateSyntaxError:
+                    # Templates meant to be extended in a context we don't
+                    # provide here (e.g. missing tag libraries) are skipped.
+                    continue
+
+
+def fill_model_meta():
+    """
+    Fill every model's `_meta` field caches. Serializers build their fields
+    per instance on each request, but read them from these caches, which
+    Django otherwise fills in each worker on first use.
+    """
+    for model in apps.get_models():
+        opts = model._meta
+        opts.get_fields(include_hidden=True)
+        opts.fields_map
+        opts._forward_fields_map
+        opts.related_objects
+        opts.concrete_fields
+
+
+def load_social_providers():
+    from allauth.socialaccount import providers
+
+    providers.registry.get_class_list()
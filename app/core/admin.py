@@ -1,8 +1,149 @@
+import uuid
+
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from mptt.admin import MPTTModelAdmin
 
-from .models import User
+from .models import (
+    Category,
+    DigitalOrderItem,
+    DigitalProduct,
+    Order,
+    PhysicalOrderItem,
+    PhysicalProduct,
+    User,
+    Vendor,
+)
 
 # Register your models here.
 
 admin.site.register(User, UserAdmin)
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that reads the row count of an unfiltered table from the
+    Postgres planner statistics instead of running COUNT(*) over it.
+    Filtered lists, small tables and other databases get an exact count.
+    """
+
+    exact_count_below = 10_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                    [queryset.model._meta.db_table],
+                )
+                estimate = cursor.fetchone()[0]
+            # reltuples is -1 until the table is first analyzed.
+            if estimate >= self.exact_count_below:
+                return estimate
+        return super().count
+
+
+class EstimatedCountAdminMixin:
+    paginator = EstimatedCountPaginator
+    # Skip the second, unfiltered COUNT(*) shown next to filtered results.
+    show_full_result_count = False
+
+
+class ProductAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
+    list_display = (
+        'name',
+        'slug',
+        'category',
+        'vendor',
+        'price',
+        'stock',
+        'is_active',
+        'updated_at',
+    )
+    list_select_related = ('category', 'vendor')
+    list_filter = ('category',)
+    # Case-sensitive lookups, so Postgres can use the plain column indexes.
+    search_fields = ('slug__exact',)
+    raw_id_fields = ('vendor',)
+
+
+@admin.register(PhysicalProduct)
+class PhysicalProductAdmin(ProductAdmin):
+    pass
+
+
+@admin.register(DigitalProduct)
+class DigitalProductAdmin(ProductAdmin):
+    pass
+
+
+class OrderItemInline(admin.TabularInline):
+    product_field = None
+    extra = 0
+    readonly_fields = ('item_subtotal',)
+
+    def get_fields(self, request, obj=None):
+        return (self.product_field, 'quantity', 'item_subtotal')
+
+    def get_readonly_fields(self, request, obj=None):
+        # Rendering the product as text reuses the joined row; an editable
+        # widget would look every product up again.
+        return (self.product_field, 'item_subtotal')
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(self.product_field)
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+class PhysicalOrderItemInline(OrderItemInline):
+    model = PhysicalOrderItem
+    product_field = 'physical_product'
+
+
+class DigitalOrderItemInline(OrderItemInline):
+    model = DigitalOrderItem
+    product_field = 'digital_product'
+
+
+@admin.register(Order)
+class OrderAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
+    list_display = ('order_id', 'user', 'status', 'created_at')
+    list_select_related = ('user',)
+    list_filter = ('status',)
+    search_fields = ('order_id',)
+    raw_id_fields = ('user',)
+    inlines = (PhysicalOrderItemInline, DigitalOrderItemInline)
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return super().get_search_results(request, queryset, search_term)
+        # The admin would compare order_id as text, which the primary key
+        # index can't serve; look the UUID up directly instead.
+        try:
+            order_id = uuid.UUID(search_term.strip())
+        except ValueError:
+            return queryset.none(), False
+        return queryset.filter(pk=order_id), False
+
+
+@admin.register(Vendor)
+class VendorAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
+    list_display = ('name', 'user')
+    list_select_related = ('user',)
+    search_fields = ('name__startswith',)
+    raw_id_fields = ('user',)
+
+
+@admin.register(Category)
+class CategoryAdmin(EstimatedCountAdminMixin, MPTTModelAdmin):
+    list_display = ('name', 'parent')
+    list_select_related = ('parent',)
+    search_fields = ('name__startswith',)
@@ -0,0 +1,206 @@
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from core.models import Job
+
+BACKOFF_BASE = 10
+BACKOFF_MAX = 60 * 60
+# Consecutive database errors a burst worker tolerates before giving up.
+BURST_DB_RETRIES = 5
+
+logger = logging.getLogger(__name__)
+
+# SQLite has no row locks, so claims from threads of the same process are
+# serialized here and the conditional UPDATE in `_claim_serialized` settles
+# races between processes.
+_claim_lock = threading.Lock()
+
+
+def enqueue(task, payload=None, *, run_at=None, max_attempts=5):
+    """
+    Queue `task` (a callable or its dotted path) to be called with `payload`
+    as keyword arguments by a `run_workers` process.
+    """
+    if callable(task):
+        task = f'{task.__module__}.{task.__qualname__}'
+    return Job.objects.create(
+        task=task,
+        payload=payload or {},
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts,
+    )
+
+
+def backoff(attempts):
+    return timedelta(seconds=min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX))
+
+
+def claim(worker_id):
+    """
+    Lock the next due job for `worker_id` and mark it running.
+    Returns None when nothing is due.
+    """
+    if connection.features.has_select_for_update_skip_locked:
+        return _claim_skip_locked(worker_id)
+    return _claim_serialized(worker_id)
+
+
+def _claim_skip_locked(worker_id):
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.StatusChoices.PENDING, run_at__lte=now)
+            .order_by('run_at')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = Job.StatusChoices.RUNNING
+        job.attempts += 1
+        job.locked_by = worker_id
+        job.locked_at = now
+        job.save(
+            update_fields=['status', 'attempts', 'locked_by', 'locked_at', 'updated_at']
+        )
+    return job
+
+
+def _claim_serialized(worker_id):
+    with _claim_lock:
+        while True:
+            now = timezone.now()
+            job = (
+                Job.objects.filter(status=Job.StatusChoices.PENDING, run_at__lte=now)
+                .order_by('run_at')
+                .first()
+            )
+            if job is None:
+                return None
+            # Matching on attempts and run_at too means a job another process
+            # ran and rescheduled since our SELECT isn't claimed early.
+            claimed = Job.objects.filter(
+                pk=job.pk,
+                status=Job.StatusChoices.PENDING,
+                attempts=job.attempts,
+                run_at__lte=now,
+            ).update(
+                status=Job.StatusChoices.RUNNING,
+                attempts=job.attempts + 1,
+                locked_by=worker_id,
+                locked_at=now,
+                updated_at=now,
+            )
+            if claimed:
+                job.refresh_from_db()
+                return job
+
+
+def execute(job):
+    """
+    Run a claimed job and record the outcome.
+    Returns one of 'succeeded', 'retried' or 'failed'.
+    """
+    try:
+        import_string(job.task)(**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            job.status = Job.StatusChoices.FAILED
+        else:
+            job.status = Job.StatusChoices.PENDING
+            job.run_at = timezone.now() + backoff(job.attempts)
+    else:
+        job.status = Job.StatusChoices.SUCCEEDED
+        job.last_error = ''
+
+    job.locked_by = ''
+    job.locked_at = None
+    job.save(
+        update_fields=[
+            'status',
+            'run_at',
+            'last_error',
+            'locked_by',
+            'locked_at',
+            'updated_at',
+        ]
+    )
+    if job.status == Job.StatusChoices.PENDING:
+        return 'retried'
+    return job.status.lower()
+
+
+def requeue_stale(timeout):
+    """
+    Hand jobs locked by workers that died mid-run back to the queue, or fail
+    them when they have used up their attempts (a job that keeps killing its
+    worker would otherwise be requeued forever).
+    Returns the number of jobs requeued and failed.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(
+        status=Job.StatusChoices.RUNNING,
+        locked_at__lt=now - timedelta(seconds=timeout),
+    )
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Job.StatusChoices.FAILED,
+        locked_by='',
+        locked_at=None,
+        last_error=f'Worker stopped responding for over {timeout} seconds',
+        updated_at=now,
+    )
+    requeued = stale.update(
+        status=Job.StatusChoices.PENDING, locked_by='', locked_at=None, updated_at=now
+    )
+    return requeued, failed
+
+
+def run_worker(index, stop, results, poll_interval=1.0, burst=False):
+    """
+    Claim and execute jobs until `stop` is set, or until the queue is empty
+    when `burst` is True. Every finished job is reported on `results` as an
+    `(outcome, seconds)` tuple.
+    """
+    worker_id = worker_name(index)
+    errors = 0
+    try:
+        while not stop.is_set():
+            close_old_connections()
+            try:
+                job = claim(worker_id)
+                if job is not None:
+                    started = time.perf_counter()
+                    outcome = execute(job)
+                    results.put((outcome, time.perf_counter() - started))
+            except DatabaseError:
+                # Locked or dropped connections are routine; a job left running
+                # is handed back by `requeue_stale`.
+                errors += 1
+                if burst and errors > BURST_DB_RETRIES:
+                    raise
+                logger.exception('Worker %s hit a database error', worker_id)
+                close_old_connections()
+                stop.wait(min(poll_interval * 2 ** errors, BACKOFF_MAX))
+                continue
+            errors = 0
+            if job is None:
+                if burst:
+                    break
+                stop.wait(poll_interval)
+    finally:
+        connection.close()
+
+
+def worker_name(index):
+    return f'{socket.gethostname()}:{os.getpid()}:{index}'
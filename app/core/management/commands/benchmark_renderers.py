@@ -0,0 +1,94 @@
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+
+from core.models import PhysicalProduct
+from core.renderers import MessagePackRenderer, msgpack
+from core.serializers import PhysicalProductSerializer
+
+
+class IndentedJSONRenderer(JSONRenderer):
+    """
+    JSON as it would be rendered without COMPACT_JSON, for comparison.
+    """
+
+    def get_indent(self, accepted_media_type, renderer_context):
+        return 4
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks response size and CPU time for each API response format'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'rows',
+            type=int,
+            nargs='?',
+            default=500,
+            help='Number of products in the benchmarked response',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=50,
+            help='Number of times each format renders the response',
+        )
+
+    def handle(self, *args, **options):
+        data = self.payload(options['rows'])
+        formats = {
+            'json (indented)': IndentedJSONRenderer(),
+            'json (compact)': JSONRenderer(),
+        }
+        if msgpack is not None:
+            formats['msgpack'] = MessagePackRenderer()
+        else:
+            self.stdout.write(
+                self.style.WARNING('msgpack is not installed, skipping MessagePack')
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Rendering {len(data)} products {options["iterations"]} times per format...'
+            )
+        )
+        self.stdout.write(
+            f'{"format":<18} {"bytes":>10} {"gzip bytes":>11} '
+            f'{"render ms":>10} {"+gzip ms":>10}'
+        )
+        for name, renderer in formats.items():
+            body = renderer.render(data)
+            render_ms = self.cpu_ms(lambda: renderer.render(data), options['iterations'])
+            gzip_ms = self.cpu_ms(
+                lambda: compress_string(renderer.render(data)), options['iterations']
+            )
+            self.stdout.write(
+                f'{name:<18} {len(body):>10,} {len(compress_string(body)):>11,} '
+                f'{render_ms:>10.3f} {gzip_ms:>10.3f}'
+            )
+
+    def payload(self, rows):
+        """
+        Serialized products from the database, topped up with generated ones
+        when there aren't enough.
+        """
+        products = list(PhysicalProduct.objects.all()[:rows])
+        products += [
+            PhysicalProduct(
+                name=f'Product {i}',
+                description=f'Description for product {i}',
+                price=Decimal(i % 500) + Decimal('0.99'),
+                stock=i % 100,
+            )
+            for i in range(rows - len(products))
+        ]
+        return PhysicalProductSerializer(products, many=True).data
+
+    def cpu_ms(self, render, iterations):
+        started = time.process_time()
+        for _ in range(iterations):
+            render()
+        return (time.process_time() - started) * 1000 / iterations
@@ -0,0 +1,124 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+GENERATORS = {
+    'v4': uuid.uuid4,
+    'v7': uuid.uuid7,
+}
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks insert throughput and primary key index size for UUIDv4 vs UUIDv7'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'rows',
+            type=int,
+            nargs='?',
+            default=1_000_000,
+            help='Number of rows to insert per key version',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10_000,
+            help='Number of rows inserted per transaction',
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the scratch tables for inspection instead of dropping them',
+        )
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        uuid_type = models.UUIDField().db_type(connection)
+        time_type = models.DateTimeField().db_type(connection)
+
+        for version, generate in GENERATORS.items():
+            table = f'benchmark_uuid_{version}'
+            with connection.cursor() as cursor:
+                cursor.execute(f'DROP TABLE IF EXISTS {table}')
+                cursor.execute(
+                    f'CREATE TABLE {table} '
+                    f'(id {uuid_type} PRIMARY KEY, created_at {time_type} NOT NULL)'
+                )
+
+            self.stdout.write(
+                self.style.SUCCESS(f'Inserting {rows} {version} keys into {table}...')
+            )
+            elapsed = self.insert(table, generate, rows, options['batch_size'])
+            size = self.index_size(table)
+
+            self.stdout.write(
+                f'{version}: {rows / elapsed:,.0f} rows/s overall, '
+                f'primary key index {self.format_size(size)}'
+            )
+
+            if not options['keep']:
+                with connection.cursor() as cursor:
+                    cursor.execute(f'DROP TABLE {table}')
+
+    def insert(self, table, generate, rows, batch_size):
+        """
+        Insert `rows` keys in batches, printing throughput for every tenth
+        of the run so a slowdown as the index grows is visible.
+        """
+        field = models.UUIDField()
+        sql = f'INSERT INTO {table} (id, created_at) VALUES (%s, %s)'
+        report_every = max(rows // 10, batch_size)
+        inserted = 0
+        started = window_started = time.perf_counter()
+        window_rows = 0
+
+        while inserted < rows:
+            count = min(batch_size, rows - inserted)
+            now = timezone.now()
+            params = [
+                (field.get_db_prep_value(generate(), connection), now)
+                for _ in range(count)
+            ]
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.executemany(sql, params)
+            inserted += count
+            window_rows += count
+
+            if window_rows >= report_every or inserted == rows:
+                window = time.perf_counter() - window_started
+                self.stdout.write(
+                    f'  {inserted:>12,} rows: {window_rows / window:,.0f} rows/s'
+                )
+                window_started = time.perf_counter()
+                window_rows = 0
+
+        return time.perf_counter() - started
+
+    def index_size(self, table):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(
+                    'SELECT pg_relation_size(indexrelid) FROM pg_index '
+                    'WHERE indrelid = %s::regclass AND indisprimary',
+                    [table],
+                )
+                return cursor.fetchone()[0]
+            if connection.vendor == 'sqlite':
+                # dbstat is an optional SQLite compile-time extension.
+                try:
+                    cursor.execute(
+                        "SELECT SUM(pgsize) FROM dbstat WHERE name = %s",
+                        [f'sqlite_autoindex_{table}_1'],
+                    )
+                except Exception:
+                    return None
+                return cursor.fetchone()[0]
+        return None
+
+    def format_size(self, size):
+        if size is None:
+            return 'size unavailable'
+        return f'{size / 1024 / 1024:,.1f} MiB'
@@ -0,0 +1,237 @@
+import csv
+import json
+import sys
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.text import slugify
+from rest_framework import serializers
+
+from core.models import Category, DigitalProduct, PhysicalProduct, Vendor
+from core.serializers import DigitalProductSerializer, PhysicalProductSerializer
+
+
+class PhysicalProductImportSerializer(PhysicalProductSerializer):
+    class Meta(PhysicalProductSerializer.Meta):
+        fields = PhysicalProductSerializer.Meta.fields + (
+            'is_active',
+            'dimensions',
+            'weight',
+        )
+
+
+class DigitalProductImportSerializer(DigitalProductSerializer):
+    class Meta(DigitalProductSerializer.Meta):
+        fields = DigitalProductSerializer.Meta.fields + (
+            'is_active',
+            'os',
+            'requirements',
+        )
+
+
+PRODUCT_TYPES = {
+    'physical': (PhysicalProduct, PhysicalProductImportSerializer),
+    'digital': (DigitalProduct, DigitalProductImportSerializer),
+}
+
+OTHER_VENDOR = 'Another vendor already has a product with this slug in this category'
+
+
+class Command(BaseCommand):
+    help = 'Streams products from a CSV or NDJSON file into the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='CSV or NDJSON file to import, or - to read NDJSON from stdin',
+        )
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'ndjson'],
+            help='Input format (defaults to the file extension)',
+        )
+        parser.add_argument(
+            '--type',
+            choices=PRODUCT_TYPES,
+            help='Product type for rows without a "type" column',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Number of rows written per bulk insert',
+        )
+        parser.add_argument(
+            '--rejects',
+            help='File to write rejected rows to (defaults to <path>.rejects.ndjson)',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('ndjson' if path == '-' else Path(path).suffix[1:])
+        if fmt == 'jsonl':
+            fmt = 'ndjson'
+        if fmt not in ('csv', 'ndjson'):
+            raise CommandError(f'Cannot tell the format of {path}, pass --format')
+        rejects_path = options['rejects'] or f'{path}.rejects.ndjson'
+        if path == '-' and not options['rejects']:
+            rejects_path = 'stdin.rejects.ndjson'
+        chunk_size = options['chunk_size']
+
+        # Small reference tables, looked up once instead of per row.
+        categories = dict(Category.objects.values_list('name', 'id'))
+        vendors = {}
+        for name, username, user_id in Vendor.objects.values_list(
+            'name', 'user__username', 'user_id'
+        ):
+            vendors[username] = vendors[name] = user_id
+        validators = {
+            product_type: serializer_class()
+            for product_type, (_, serializer_class) in PRODUCT_TYPES.items()
+        }
+
+        buffers = {product_type: {} for product_type in PRODUCT_TYPES}
+        imported = 0
+        self.rejected = 0
+        self.rejects = None
+        self.rejects_path = rejects_path
+        started = time.perf_counter()
+
+        stream = sys.stdin if path == '-' else open(path, newline='')
+        try:
+            with stream:
+                for line, row in self.read_rows(stream, fmt):
+                    try:
+                        product_type, product = self.build(
+                            row, options['type'], categories, vendors, validators
+                        )
+                    except serializers.ValidationError as e:
+                        self.reject(line, row, e.detail)
+                        continue
+
+                    # Later rows win over earlier ones with the same key, as an
+                    # upsert can't touch the same row twice in one statement.
+                    buffer = buffers[product_type]
+                    key = (product.slug, product.category_id)
+                    if key in buffer and buffer[key][2].vendor_id != product.vendor_id:
+                        self.reject(line, row, {'slug': [OTHER_VENDOR]})
+                        continue
+                    buffer[key] = (line, row, product)
+                    if len(buffer) >= chunk_size:
+                        imported += self.flush(product_type, buffer)
+                        self.progress(imported, started)
+
+            for product_type, buffer in buffers.items():
+                imported += self.flush(product_type, buffer)
+        finally:
+            if self.rejects is not None:
+                self.rejects.close()
+
+        self.progress(imported, started)
+        if self.rejected:
+            self.stdout.write(
+                self.style.WARNING(f'Rejected {self.rejected} rows, see {rejects_path}')
+            )
+        self.stdout.write(self.style.SUCCESS(f'Successfully imported {imported} products'))
+
+    def reject(self, line, row, errors):
+        if self.rejects is None:
+            self.rejects = open(self.rejects_path, 'w')
+        record = {'line': line, 'row': row, 'errors': errors}
+        self.rejects.write(json.dumps(record) + '\n')
+        self.rejected += 1
+
+    def read_rows(self, stream, fmt):
+        """
+        Yield (line number, row) pairs from the input one at a time.
+        """
+        if fmt == 'csv':
+            reader = csv.DictReader(stream)
+            for row in reader:
+                # Empty cells mean "no value", like a missing NDJSON key.
+                yield reader.line_num, {
+                    key: value for key, value in row.items() if value != ''
+                }
+            return
+
+        for line, text in enumerate(stream, start=1):
+            if not text.strip():
+                continue
+            try:
+                yield line, json.loads(text)
+            except json.JSONDecodeError:
+                yield line, text
+
+    def build(self, row, default_type, categories, vendors, validators):
+        """
+        Validate a row and turn it into an unsaved product.
+        Raises ValidationError describing everything wrong with the row.
+        """
+        if not isinstance(row, dict):
+            raise serializers.ValidationError({'row': 'Expected a JSON object'})
+
+        errors = {}
+        product_type = row.get('type') or default_type
+        if product_type not in PRODUCT_TYPES:
+            errors['type'] = [f'Must be one of: {", ".join(PRODUCT_TYPES)}']
+        category_id = categories.get(row.get('category'))
+        if category_id is None:
+            errors['category'] = [f'Unknown category {row.get("category")!r}']
+        vendor_id = vendors.get(row.get('vendor'))
+        if vendor_id is None:
+            errors['vendor'] = [f'Unknown vendor {row.get("vendor")!r}']
+        if 'type' in errors:
+            raise serializers.ValidationError(errors)
+
+        try:
+            data = validators[product_type].run_validation(row)
+        except serializers.ValidationError as e:
+            errors.update(e.detail)
+        slug = slugify(row.get('slug') or row.get('name') or '')
+        if not slug and 'name' not in errors:
+            errors['slug'] = ['Cannot derive a slug from the name']
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        model, _ = PRODUCT_TYPES[product_type]
+        return product_type, model(
+            **data, slug=slug, category_id=category_id, vendor_id=vendor_id
+        )
+
+    def flush(self, product_type, buffer):
+        if not buffer:
+            return 0
+        model, serializer_class = PRODUCT_TYPES[product_type]
+        with transaction.atomic():
+            # The upsert keeps the existing vendor, so rows that would update
+            # another vendor's product are rejected rather than merged into it.
+            owners = {
+                (slug, category_id): vendor_id
+                for slug, category_id, vendor_id in model.objects.filter(
+                    slug__in={slug for slug, _ in buffer},
+                    category_id__in={category_id for _, category_id in buffer},
+                ).values_list('slug', 'category_id', 'vendor_id')
+            }
+            products = []
+            for key, (line, row, product) in buffer.items():
+                if owners.get(key, product.vendor_id) != product.vendor_id:
+                    self.reject(line, row, {'slug': [OTHER_VENDOR]})
+                else:
+                    products.append(product)
+            model.objects.bulk_create(
+                products,
+                update_conflicts=True,
+                unique_fields=['slug', 'category'],
+                update_fields=[*serializer_class.Meta.fields, 'updated_at'],
+            )
+        buffer.clear()
+        return len(products)
+
+    def progress(self, imported, started):
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'Imported {imported} rows, rejected {self.rejected} '
+            f'({(imported + self.rejected) / elapsed:,.0f} rows/s)'
+        )
@@ -0,0 +1,120 @@
+import json
+import os
+import subprocess
+import sys
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Run in a fresh interpreter so nothing imported by manage.py skews the numbers.
+PROBE = """
+import json, sys, tracemalloc
+
+def rss_kib():
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+trace = '--trace' in sys.argv
+if trace:
+    tracemalloc.start()
+
+stages = [('interpreter', rss_kib())]
+import django
+django.setup()
+stages.append(('django.setup()', rss_kib()))
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+stages.append(('wsgi application', rss_kib()))
+from config.warmup import warmup
+warmup()
+stages.append(('warmup', rss_kib()))
+
+result = {'stages': stages, 'modules': {}}
+if trace:
+    files = {
+        getattr(module, '__file__', None): name
+        for name, module in list(sys.modules.items())
+    }
+    for stat in tracemalloc.take_snapshot().statistics('filename'):
+        filename = stat.traceback[0].filename
+        result['modules'][files.get(filename, filename)] = stat.size
+print(json.dumps(result))
+"""
+
+
+class Command(BaseCommand):
+    help = 'Reports import time and memory per package for a cold application start'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=15,
+            help='Number of packages and modules to list',
+        )
+
+    def handle(self, *args, **options):
+        top = options['top']
+
+        # tracemalloc inflates RSS, so stages are measured in the untraced run.
+        timed = self.probe('-X', 'importtime')
+        traced = self.probe(trace=True)
+
+        self.stdout.write(self.style.SUCCESS('Resident memory by startup stage:'))
+        previous = None
+        for stage, kib in json.loads(timed.stdout)['stages']:
+            growth = f' (+{(kib - previous) / 1024:.1f})' if previous else ''
+            self.stdout.write(f'  {stage:<20} {kib / 1024:8.1f} MiB{growth}')
+            previous = kib
+
+        imports = self.parse_importtime(timed.stderr)
+        package_time = Counter()
+        for module, (self_us, _) in imports.items():
+            package_time[module.split('.')[0]] += self_us
+        package_memory = Counter()
+        for module, size in json.loads(traced.stdout)['modules'].items():
+            package_memory[module.split('.')[0]] += size
+
+        self.stdout.write(self.style.SUCCESS('Import time and allocations by package:'))
+        self.stdout.write(f'  {"package":<30} {"import ms":>10} {"memory MiB":>11}')
+        for package, self_us in package_time.most_common(top):
+            self.stdout.write(
+                f'  {package:<30} {self_us / 1000:10.1f} '
+                f'{package_memory[package] / 1024 / 1024:11.2f}'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Slowest modules (cumulative):'))
+        slowest = sorted(imports.items(), key=lambda item: item[1][1], reverse=True)
+        for module, (_, cumulative_us) in slowest[:top]:
+            self.stdout.write(f'  {module:<50} {cumulative_us / 1000:10.1f} ms')
+
+    def probe(self, *flags, trace=False):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE}
+        command = [sys.executable, *flags, '-c', PROBE]
+        if trace:
+            command.append('--trace')
+        result = subprocess.run(
+            command, cwd=settings.BASE_DIR, env=env, capture_output=True, text=True
+        )
+        if result.returncode:
+            raise CommandError(f'Startup probe failed:\n{result.stderr}')
+        return result
+
+    def parse_importtime(self, output):
+        """
+        Parse `-X importtime` lines into {module: (self_us, cumulative_us)}.
+        """
+        imports = {}
+        for line in output.splitlines():
+            if not line.startswith('import time:'):
+                continue
+            self_us, cumulative_us, module = line[len('import time:'):].split('|')
+            if not self_us.strip().isdigit():
+                continue
+            imports[module.strip()] = (int(self_us), int(cumulative_us))
+        return imports
@@ -0,0 +1,99 @@
+import os
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Case, When
+
+from core.models import DigitalOrderItem, Order, PhysicalOrderItem
+
+
+def uuid7_at(moment):
+    """
+    Build a UUIDv7 whose timestamp is `moment` rather than the current time,
+    so re-keyed rows sort the same way as the orders were created.
+    """
+    value = (int(moment.timestamp() * 1000) & (2**48 - 1)) << 80
+    value |= int.from_bytes(os.urandom(10)) & (2**80 - 1)
+    value = value & ~(0xF << 76) | 0x7 << 76
+    value = value & ~(0x3 << 62) | 0x2 << 62
+    return uuid.UUID(int=value)
+
+
+class Command(BaseCommand):
+    help = 'Rewrites random UUIDv4 order ids as time-ordered UUIDv7 ids'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of orders to re-key per transaction',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count the orders that would be re-keyed without changing them',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        total = 0
+        last_created = None
+
+        while True:
+            orders = Order.objects.order_by('created_at')
+            if last_created is not None:
+                orders = orders.filter(created_at__gt=last_created)
+            batch = list(orders.values_list('order_id', 'created_at')[:batch_size])
+            if not batch:
+                break
+
+            # Pull in every order sharing the boundary timestamp so the next
+            # page can resume strictly after it.
+            last_created = batch[-1][1]
+            batch = [row for row in batch if row[1] != last_created]
+            batch += Order.objects.filter(created_at=last_created).values_list(
+                'order_id', 'created_at'
+            )
+
+            new_ids = {
+                order_id: uuid7_at(created_at)
+                for order_id, created_at in batch
+                if order_id.version == 4
+            }
+            if new_ids and not options['dry_run']:
+                self.rekey(new_ids)
+            total += len(new_ids)
+            if options['dry_run']:
+                self.stdout.write(f'Would re-key {total} orders...')
+            else:
+                self.stdout.write(f'Re-keyed {total} orders...')
+
+        if options['dry_run']:
+            self.stdout.write(
+                self.style.SUCCESS(f'Dry run: would re-key {total} orders')
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Successfully re-keyed {total} orders'))
+
+    @transaction.atomic
+    def rekey(self, new_ids):
+        """
+        Swap order ids and repoint their items in one transaction. Django
+        creates foreign keys as deferrable, so the constraints are only
+        checked once every table agrees again at commit.
+        """
+        for model, field in (
+            (Order, 'order_id'),
+            (PhysicalOrderItem, 'order_id'),
+            (DigitalOrderItem, 'order_id'),
+        ):
+            model.objects.filter(**{f'{field}__in': new_ids}).update(
+                **{
+                    field: Case(
+                        *(When(**{field: old}, then=new) for old, new in new_ids.items()),
+                        default=field,
+                    )
+                }
+            )
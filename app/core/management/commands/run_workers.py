@@ -0,0 +1,164 @@
+import multiprocessing
+import queue
+import signal
+import threading
+import time
+from collections import Counter
+
+from django import db
+from django.core.management.base import BaseCommand, CommandError
+
+from core import jobs, workers
+
+
+class Command(BaseCommand):
+    help = 'Runs a pool of workers that process jobs from the database queue'
+
+    # Seconds between sweeps for jobs left locked by workers that died.
+    requeue_interval = 60
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of workers to run',
+        )
+        parser.add_argument(
+            '--mode',
+            choices=['thread', 'process'],
+            default='thread',
+            help='Run workers as threads (I/O bound jobs) or processes (CPU bound jobs)',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds an idle worker waits before polling the queue again',
+        )
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Exit once the queue has no due jobs left',
+        )
+        parser.add_argument(
+            '--stale-after',
+            type=int,
+            default=60 * 60,
+            help='Requeue running jobs locked for longer than this many seconds',
+        )
+        parser.add_argument(
+            '--stats-interval',
+            type=float,
+            default=30.0,
+            help='Seconds between throughput reports',
+        )
+
+    def handle(self, *args, **options):
+        self.requeue_stale(options['stale_after'])
+
+        if options['mode'] == 'process':
+            # Children must open their own database connections.
+            db.connections.close_all()
+            ctx = multiprocessing.get_context()
+            stop, results = ctx.Event(), ctx.Queue()
+            spawn, target = ctx.Process, workers.run_worker_process
+        else:
+            stop, results = threading.Event(), queue.Queue()
+            spawn, target = workers.WorkerThread, jobs.run_worker
+
+        pool = [
+            spawn(
+                target=target,
+                args=(i, stop, results, options['poll_interval'], options['burst']),
+            )
+            for i in range(options['workers'])
+        ]
+
+        def shutdown(signum, frame):
+            self.stdout.write('Stopping workers after their current job...')
+            stop.set()
+
+        signal.signal(signal.SIGINT, shutdown)
+        signal.signal(signal.SIGTERM, shutdown)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Starting {len(pool)} {options["mode"]} workers...'
+            )
+        )
+        for worker in pool:
+            worker.start()
+
+        totals = Counter()
+        busy = 0.0
+        started = last_report = last_requeue = time.monotonic()
+        while any(worker.is_alive() for worker in pool):
+            busy += self.collect(results, totals, timeout=0.5)
+            if time.monotonic() - last_report >= options['stats_interval']:
+                self.report(totals, busy, time.monotonic() - started)
+                last_report = time.monotonic()
+            if time.monotonic() - last_requeue >= self.requeue_interval:
+                self.requeue_stale(options['stale_after'])
+                last_requeue = time.monotonic()
+            if self.crashed(pool):
+                stop.set()
+
+        for worker in pool:
+            worker.join()
+        busy += self.collect(results, totals)
+        self.report(totals, busy, time.monotonic() - started)
+
+        crashed = self.crashed(pool)
+        if crashed:
+            details = ', '.join(
+                f'{worker.name} ({self.describe_crash(worker)})' for worker in crashed
+            )
+            raise CommandError(f'{len(crashed)} workers exited with an error: {details}')
+
+    def requeue_stale(self, timeout):
+        requeued, failed = jobs.requeue_stale(timeout)
+        if requeued:
+            self.stdout.write(self.style.WARNING(f'Requeued {requeued} stale jobs'))
+        if failed:
+            self.stdout.write(
+                self.style.ERROR(f'Failed {failed} stale jobs out of attempts')
+            )
+
+    def crashed(self, pool):
+        return [
+            worker
+            for worker in pool
+            if getattr(worker, 'exitcode', None) or getattr(worker, 'error', None)
+        ]
+
+    def describe_crash(self, worker):
+        if getattr(worker, 'error', None) is not None:
+            return f'{type(worker.error).__name__}: {worker.error}'
+        return f'exit code {worker.exitcode}'
+
+    def collect(self, results, totals, timeout=None):
+        """
+        Drain finished job reports into `totals`, waiting up to `timeout`
+        seconds for the first one. Returns the seconds spent running them.
+        """
+        busy = 0.0
+        try:
+            outcome, seconds = results.get(block=timeout is not None, timeout=timeout)
+            while True:
+                totals[outcome] += 1
+                busy += seconds
+                outcome, seconds = results.get_nowait()
+        except queue.Empty:
+            pass
+        return busy
+
+    def report(self, totals, busy, elapsed):
+        done = sum(totals.values())
+        rate = done / elapsed if elapsed else 0.0
+        mean = busy / done if done else 0.0
+        self.stdout.write(
+            f'{done} jobs in {elapsed:.1f}s ({rate:.2f} jobs/s, {mean:.3f}s avg): '
+            f'{totals["succeeded"]} succeeded, {totals["retried"]} retried, '
+            f'{totals["failed"]} failed'
+        )
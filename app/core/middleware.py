@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+
+
+class ThresholdGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that leaves streaming responses and responses smaller
+    than `GZIP_MIN_LENGTH` bytes uncompressed, where gzip costs more CPU
+    than it saves on the wire.
+    """
+
+    def process_response(self, request, response):
+        if response.streaming or len(response.content) < settings.GZIP_MIN_LENGTH:
+            return response
+        return super().process_response(request, response)
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-19 07:02
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_job'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='order',
+            name='order_id',
+            field=models.UUIDField(default=uuid.uuid7, primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.0.1 on 2026-10-19 09:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_order_status_created_at_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('product_type', models.CharField(choices=[('physical', 'Physical'), ('digital', 'Digital')], max_length=10)),
+                ('product_id', models.BigIntegerField()),
+                ('slug', models.SlugField(db_index=False, max_length=255)),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='digitalproduct',
+            index=models.Index(fields=['updated_at', 'id'], name='digitalproduct_updated_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='physicalproduct',
+            index=models.Index(fields=['updated_at', 'id'], name='physicalproduct_updated_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productdeletion',
+            index=models.Index(fields=['deleted_at', 'id'], name='productdeletion_deleted_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_productdeletion_updated_at_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='vendor',
+            name='name',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+    ]
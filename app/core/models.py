@@ -2,6 +2,7 @@ import uuid
 
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 from django.utils.text import slugify
 from mptt.models import MPTTModel, TreeForeignKey
 
@@ -13,7 +14,7 @@ class User(AbstractUser):
 
 
 class Vendor(models.Model):
-    name = models.CharField(max_length=100)
+    name = models.CharField(max_length=100, db_index=True)
     description = models.TextField(blank=True, null=True)
     image = models.ImageField(upload_to='vendors/images', blank=True, null=True)
     user = models.OneToOneField(User, on_delete=models.CASCADE)
@@ -91,6 +92,9 @@ class PhysicalProduct(ProductSpec):
                 name='unique_physicalproduct_slug_per_category',
             )
         ]
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='physicalproduct_updated_at_idx'),
+        ]
 
 
 class DigitalProduct(ProductSpec):
@@ -104,6 +108,28 @@ class DigitalProduct(ProductSpec):
                 name='unique_digitalproduct_slug_per_category',
             )
         ]
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='digitalproduct_updated_at_idx'),
+        ]
+
+
+class ProductDeletion(models.Model):
+    class ProductTypeChoices(models.TextChoices):
+        PHYSICAL = "physical"
+        DIGITAL = "digital"
+
+    product_type = models.CharField(max_length=10, choices=ProductTypeChoices.choices)
+    product_id = models.BigIntegerField()
+    slug = models.SlugField(max_length=255, db_index=False)
+    deleted_at = models.DateTimeField(auto_now_add=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['deleted_at', 'id'], name='productdeletion_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"Deleted {self.product_type} product {self.product_id}"
 
 
 class Order(models.Model):
@@ -112,7 +138,7 @@ class Order(models.Model):
         CONFIRMED = "Confirmed"
         CANCELLED = "Cancelled"
 
-    order_id = models.UUIDField(primary_key=True, default=uuid.uuid4)
+    order_id = models.UUIDField(primary_key=True, default=uuid.uuid7)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     status = models.CharField(
         max_length=10, choices=StatusChoices.choices, default=StatusChoices.PENDING
@@ -128,9 +154,15 @@ class Order(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at'], name='order_created_at_idx'),
+            models.Index(
+                fields=['status', 'created_at'], name='order_status_created_at_idx'
+            ),
+        ]
 
     def __str__(self):
-        return f"Order {self.order_id} by {self.user.name}"
+        return f"Order {self.order_id} by {self.user.username}"
 
 
 class PhysicalOrderItem(models.Model):
@@ -151,3 +183,34 @@ class DigitalOrderItem(models.Model):
     @property
     def item_subtotal(self):
         return self.digital_product.price * self.quantity
+
+
+class Job(models.Model):
+    class StatusChoices(models.TextChoices):
+        PENDING = "Pending"
+        RUNNING = "Running"
+        SUCCEEDED = "Succeeded"
+        FAILED = "Failed"
+
+    task = models.CharField(max_length=255)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=10, choices=StatusChoices.choices, default=StatusChoices.PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=255, blank=True)
+    locked_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['run_at']
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx'),
+        ]
+
+    def __str__(self):
+        return f"Job {self.pk} {self.task} ({self.status})"
@@ -3,7 +3,20 @@ from rest_framework import serializers
 from core.models import DigitalProduct, PhysicalProduct
 
 
-class PhysicalProductSerializer(serializers.ModelSerializer):
+class SparseFieldsModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer that takes an optional `fields` argument naming the
+    subset of its declared fields to keep.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class PhysicalProductSerializer(SparseFieldsModelSerializer):
     class Meta:
         model = PhysicalProduct
         fields = (
@@ -19,7 +32,7 @@ class PhysicalProductSerializer(serializers.ModelSerializer):
         return value
 
 
-class DigitalProductSerializer(serializers.ModelSerializer):
+class DigitalProductSerializer(SparseFieldsModelSerializer):
     class Meta:
         model = DigitalProduct
         fields = (
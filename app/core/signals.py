@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from core.models import DigitalProduct, PhysicalProduct, ProductDeletion
+
+
+@receiver(post_delete, sender=PhysicalProduct)
+@receiver(post_delete, sender=DigitalProduct)
+def log_product_deletion(sender, instance, **kwargs):
+    """
+    Keep a tombstone so the changes feed can tell mirrors about deletes.
+    """
+    ProductDeletion.objects.create(
+        product_type=(
+            ProductDeletion.ProductTypeChoices.PHYSICAL
+            if sender is PhysicalProduct
+            else ProductDeletion.ProductTypeChoices.DIGITAL
+        ),
+        product_id=instance.pk,
+        slug=instance.slug,
+    )
@@ -1,3 +1,662 @@
-from django.test import TestCase
+import csv
+import gzip
+import hashlib
+import json
+import queue
+import tempfile
+import threading
+import unittest
+import uuid
+from datetime import datetime, timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import OperationalError, connection
+from django.db.models import QuerySet
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from config.warmup import fill_model_meta
+from core import jobs
+from core.management.commands.rekey_orders import uuid7_at
+from core.middleware import ThresholdGZipMiddleware
+from core.models import (
+    Category,
+    Job,
+    Order,
+    PhysicalOrderItem,
+    PhysicalProduct,
+    ProductDeletion,
+    User,
+    Vendor,
+)
+from core.renderers import msgpack
 
 # Create your tests here.
+
+calls = []
+
+
+def record(**payload):
+    calls.append(payload)
+
+
+def explode():
+    raise ValueError('boom')
+
+
+class ClaimTests(TestCase):
+    def test_claims_oldest_due_job_and_marks_it_running(self):
+        later = jobs.enqueue(record, run_at=timezone.now() - timedelta(minutes=1))
+        earlier = jobs.enqueue(record, run_at=timezone.now() - timedelta(minutes=5))
+
+        job = jobs._claim_serialized('worker-1')
+
+        self.assertEqual(job.pk, earlier.pk)
+        self.assertEqual(job.status, Job.StatusChoices.RUNNING)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(job.locked_by, 'worker-1')
+        self.assertIsNotNone(job.locked_at)
+        later.refresh_from_db()
+        self.assertEqual(later.status, Job.StatusChoices.PENDING)
+
+    def test_does_not_claim_the_same_job_twice(self):
+        jobs.enqueue(record)
+
+        self.assertIsNotNone(jobs._claim_serialized('worker-1'))
+        self.assertIsNone(jobs._claim_serialized('worker-2'))
+
+    def test_does_not_claim_a_job_rescheduled_since_it_was_read(self):
+        job = jobs.enqueue(record)
+        later = timezone.now() + timedelta(minutes=5)
+        first = QuerySet.first
+
+        def read_then_race(queryset):
+            # Another process claims, runs and reschedules the job between
+            # our SELECT and our UPDATE.
+            found = first(queryset)
+            Job.objects.filter(pk=job.pk).update(attempts=1, run_at=later)
+            return found
+
+        with mock.patch.object(QuerySet, 'first', read_then_race):
+            self.assertIsNone(jobs._claim_serialized('worker-1'))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.StatusChoices.PENDING)
+        self.assertEqual(job.attempts, 1)
+
+    def test_skips_jobs_that_are_not_due(self):
+        jobs.enqueue(record, run_at=timezone.now() + timedelta(minutes=5))
+
+        self.assertIsNone(jobs._claim_serialized('worker-1'))
+
+    def test_enqueue_stores_dotted_path_of_callable(self):
+        job = jobs.enqueue(record, {'n': 1})
+
+        self.assertEqual(job.task, 'core.tests.record')
+        self.assertEqual(job.payload, {'n': 1})
+
+
+class ExecuteTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_success(self):
+        jobs.enqueue(record, {'n': 1})
+        job = jobs.claim('worker-1')
+
+        self.assertEqual(jobs.execute(job), 'succeeded')
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.StatusChoices.SUCCEEDED)
+        self.assertEqual(job.locked_by, '')
+        self.assertEqual(calls, [{'n': 1}])
+
+    def test_failure_is_retried_with_backoff(self):
+        jobs.enqueue(explode, max_attempts=3)
+        job = jobs.claim('worker-1')
+        before = timezone.now()
+
+        self.assertEqual(jobs.execute(job), 'retried')
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.StatusChoices.PENDING)
+        self.assertIn('ValueError: boom', job.last_error)
+        self.assertGreaterEqual(job.run_at, before + jobs.backoff(1))
+        self.assertIsNone(jobs.claim('worker-1'))
+
+    def test_failure_on_last_attempt_fails_the_job(self):
+        jobs.enqueue(explode, max_attempts=1)
+        job = jobs.claim('worker-1')
+
+        self.assertEqual(jobs.execute(job), 'failed')
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.StatusChoices.FAILED)
+
+    def test_backoff_doubles_up_to_the_cap(self):
+        self.assertEqual(jobs.backoff(1), timedelta(seconds=jobs.BACKOFF_BASE))
+        self.assertEqual(jobs.backoff(2), timedelta(seconds=jobs.BACKOFF_BASE * 2))
+        self.assertEqual(jobs.backoff(50), timedelta(seconds=jobs.BACKOFF_MAX))
+
+
+class RequeueStaleTests(TestCase):
+    def lock(self, max_attempts, locked_for):
+        jobs.enqueue(record, max_attempts=max_attempts)
+        job = jobs.claim('worker-1')
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - timedelta(seconds=locked_for)
+        )
+        return job
+
+    def test_requeues_jobs_with_attempts_left(self):
+        job = self.lock(max_attempts=3, locked_for=120)
+
+        self.assertEqual(jobs.requeue_stale(60), (1, 0))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.StatusChoices.PENDING)
+        self.assertEqual(job.locked_by, '')
+
+    def test_fails_jobs_out_of_attempts(self):
+        job = self.lock(max_attempts=1, locked_for=120)
+
+        self.assertEqual(jobs.requeue_stale(60), (0, 1))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.StatusChoices.FAILED)
+
+    def test_leaves_recently_locked_jobs_alone(self):
+        job = self.lock(max_attempts=3, locked_for=10)
+
+        self.assertEqual(jobs.requeue_stale(60), (0, 0))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.StatusChoices.RUNNING)
+
+
+# Workers close their connection when they exit, which TestCase's wrapping
+# transaction doesn't allow.
+class RunWorkerTests(TransactionTestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_keeps_going_after_a_database_error(self):
+        jobs.enqueue(record, {'n': 1})
+        claim = jobs.claim
+        errors = [OperationalError('database is locked')]
+
+        def flaky_claim(worker_id):
+            if errors:
+                raise errors.pop()
+            return claim(worker_id)
+
+        results = queue.Queue()
+        with (
+            mock.patch('core.jobs.claim', flaky_claim),
+            self.assertLogs('core.jobs', 'ERROR'),
+        ):
+            jobs.run_worker(0, threading.Event(), results, poll_interval=0, burst=True)
+
+        self.assertEqual(calls, [{'n': 1}])
+        self.assertEqual(results.get_nowait()[0], 'succeeded')
+
+    def test_burst_worker_gives_up_on_persistent_database_errors(self):
+        with (
+            mock.patch('core.jobs.claim', side_effect=OperationalError('locked')),
+            self.assertLogs('core.jobs', 'ERROR'),
+            self.assertRaises(OperationalError),
+        ):
+            jobs.run_worker(
+                0, threading.Event(), queue.Queue(), poll_interval=0, burst=True
+            )
+
+    def test_command_reports_crashed_threads(self):
+        with (
+            mock.patch('core.jobs.claim', side_effect=RuntimeError('broken')),
+            mock.patch('threading.excepthook'),
+            self.assertRaisesMessage(CommandError, 'RuntimeError: broken'),
+        ):
+            call_command('run_workers', '--workers', '2', '--burst', stdout=StringIO())
+
+
+class ImportProductsTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name='Tools')
+        for name in ('acme', 'globex'):
+            user = User.objects.create_user(username=name)
+            Vendor.objects.create(name=name.title(), user=user)
+        self.acme = User.objects.get(username='acme')
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / 'products.ndjson'
+
+    def run_import(self, *rows):
+        self.path.write_text(''.join(json.dumps(row) + '\n' for row in rows))
+        call_command('import_products', str(self.path), stdout=StringIO())
+
+    def rejects(self):
+        rejects = Path(f'{self.path}.rejects.ndjson')
+        if not rejects.exists():
+            return []
+        return [json.loads(line) for line in rejects.read_text().splitlines()]
+
+    def row(self, vendor, **fields):
+        return {
+            'type': 'physical',
+            'name': 'Hammer',
+            'price': '9.99',
+            'stock': 5,
+            'category': 'Tools',
+            'vendor': vendor,
+            **fields,
+        }
+
+    def test_updates_the_vendors_own_product(self):
+        self.run_import(self.row('acme'))
+        self.run_import(self.row('acme', price='12.50'))
+
+        product = PhysicalProduct.objects.get(slug='hammer')
+        self.assertEqual(str(product.price), '12.50')
+        self.assertEqual(self.rejects(), [])
+
+    def test_rejects_rows_that_would_take_over_another_vendors_product(self):
+        self.run_import(self.row('acme'))
+        self.run_import(self.row('globex', price='1.00'))
+
+        product = PhysicalProduct.objects.get(slug='hammer')
+        self.assertEqual(product.vendor, self.acme)
+        self.assertEqual(str(product.price), '9.99')
+        [reject] = self.rejects()
+        self.assertEqual(reject['line'], 1)
+        self.assertIn('slug', reject['errors'])
+
+    def test_rejects_conflicting_vendors_within_one_file(self):
+        self.run_import(self.row('acme'), self.row('globex'))
+
+        product = PhysicalProduct.objects.get(slug='hammer')
+        self.assertEqual(product.vendor, self.acme)
+        self.assertEqual([reject['line'] for reject in self.rejects()], [2])
+
+
+class BatchLookupTests(TestCase):
+    def setUp(self):
+        vendor = User.objects.create_user(username='acme')
+        tools = Category.objects.create(name='Tools')
+        garden = Category.objects.create(name='Garden')
+        # save() keeps slugs globally unique, but imports only keep them
+        # unique per category.
+        self.products = [
+            PhysicalProduct.objects.create(
+                name=name,
+                slug=slug,
+                price='9.99',
+                stock=1,
+                category=category,
+                vendor=vendor,
+            )
+            for name, slug, category in (
+                ('Hammer', 'hammer', tools),
+                ('Garden hammer', 'hammer', garden),
+                ('Saw', 'saw', tools),
+            )
+        ]
+
+    def test_slugs_map_to_every_matching_product(self):
+        response = self.client.get('/api/physicalproducts/batch/?slugs=saw,hammer,nope')
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(list(results), ['saw', 'hammer'])
+        self.assertEqual([item['name'] for item in results['saw']], ['Saw'])
+        self.assertEqual(
+            [item['name'] for item in results['hammer']], ['Hammer', 'Garden hammer']
+        )
+        self.assertEqual(response.json()['missing'], ['nope'])
+
+    def test_ids_keep_the_callers_order(self):
+        hammer, _, saw = self.products
+        response = self.client.get(
+            f'/api/physicalproducts/batch/?ids={saw.pk},999,{hammer.pk},{saw.pk}'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(list(results), [str(saw.pk), str(hammer.pk)])
+        self.assertEqual([item['name'] for item in results[str(hammer.pk)]], ['Hammer'])
+        self.assertEqual(response.json()['missing'], [999])
+
+    def test_rejects_non_integer_ids(self):
+        response = self.client.get('/api/physicalproducts/batch/?ids=1,two')
+
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(CHANGES_SETTLE_SECONDS=60)
+class ProductChangesTests(TestCase):
+    def setUp(self):
+        vendor = User.objects.create_user(username='acme')
+        category = Category.objects.create(name='Tools')
+        for i in range(3):
+            PhysicalProduct.objects.create(
+                name=f'Hammer {i}',
+                price='9.99',
+                stock=1,
+                category=category,
+                vendor=vendor,
+            )
+        self.settled = timezone.now() - timedelta(minutes=2)
+        PhysicalProduct.objects.update(updated_at=self.settled)
+
+    def changes(self, cursor=''):
+        changes = []
+        page = {'cursor': cursor, 'has_more': True}
+        while page['has_more']:
+            page = self.client.get(
+                '/api/changes/', {'limit': 2, 'cursor': page['cursor']}
+            ).json()
+            changes += page['results']
+        return changes, page['cursor']
+
+    def test_pages_through_changes_with_a_cursor(self):
+        changes, _ = self.changes()
+
+        self.assertCountEqual(
+            [change['id'] for change in changes],
+            PhysicalProduct.objects.values_list('id', flat=True),
+        )
+
+    def test_holds_back_changes_younger_than_the_settle_time(self):
+        recent = PhysicalProduct.objects.filter(name='Hammer 0')
+        recent.update(updated_at=timezone.now())
+
+        changes, _ = self.changes()
+
+        names = sorted(change['data']['name'] for change in changes)
+        self.assertEqual(names, ['Hammer 1', 'Hammer 2'])
+
+    def test_reports_deletions_after_the_cursor(self):
+        _, cursor = self.changes()
+        product = PhysicalProduct.objects.get(name='Hammer 1')
+        product_id = product.pk
+        product.delete()
+        ProductDeletion.objects.update(deleted_at=self.settled + timedelta(seconds=1))
+
+        [change], _ = self.changes(cursor)
+
+        self.assertEqual(change['type'], 'physical')
+        self.assertEqual(change['id'], product_id)
+        self.assertEqual(change['slug'], product.slug)
+        self.assertTrue(change['deleted'])
+        self.assertIsNone(change['data'])
+
+
+class ExportOrdersTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='buyer')
+        product = PhysicalProduct.objects.create(
+            name='Hammer',
+            price='9.99',
+            stock=1,
+            category=Category.objects.create(name='Tools'),
+            vendor=user,
+        )
+        # Two orders on the first day, one on the second, one outside the range.
+        for day, hour in ((1, 9), (1, 17), (2, 12), (3, 8)):
+            order = Order.objects.create(user=user)
+            Order.objects.filter(pk=order.pk).update(
+                created_at=timezone.make_aware(datetime(2026, 1, day, hour))
+            )
+            PhysicalOrderItem.objects.create(
+                order=order, physical_product=product, quantity=day
+            )
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.output_dir = Path(directory.name)
+
+    def export(self, fmt):
+        call_command(
+            'export_orders',
+            '--start=2026-01-01',
+            '--end=2026-01-03',
+            '--shards=2',
+            '--processes=1',
+            f'--format={fmt}',
+            f'--output-dir={self.output_dir}',
+            stdout=StringIO(),
+        )
+        [manifest_path] = self.output_dir.glob('*.manifest.json')
+        return json.loads(manifest_path.read_text())
+
+    def assert_checksums(self, manifest):
+        for shard in manifest['shards']:
+            path = self.output_dir / shard['file']
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            self.assertEqual(shard['sha256'], digest)
+            self.assertEqual(shard['bytes'], path.stat().st_size)
+
+    def read(self, shard):
+        with gzip.open(self.output_dir / shard['file'], 'rt', newline='') as f:
+            return f.read()
+
+    def test_ndjson(self):
+        manifest = self.export('ndjson')
+
+        self.assertEqual(manifest['orders'], 3)
+        self.assertEqual([shard['orders'] for shard in manifest['shards']], [2, 1])
+        self.assert_checksums(manifest)
+        lines = self.read(manifest['shards'][1]).splitlines()
+        records = [json.loads(line) for line in lines]
+        self.assertEqual(records[0]['items'][0]['quantity'], 2)
+
+    def test_csv(self):
+        manifest = self.export('csv')
+
+        self.assertEqual([shard['orders'] for shard in manifest['shards']], [2, 1])
+        self.assert_checksums(manifest)
+        rows = list(csv.DictReader(StringIO(self.read(manifest['shards'][0]))))
+        self.assertEqual([row['item_quantity'] for row in rows], ['1', '1'])
+
+    def test_rejects_counts_below_one(self):
+        for option in ('--shards=0', '--shards=-1', '--processes=0', '--chunk-size=0'):
+            with self.subTest(option), self.assertRaises(CommandError):
+                call_command('export_orders', option, stdout=StringIO())
+
+
+@unittest.skipIf(msgpack is None, 'msgpack is not installed')
+class MessagePackTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='acme')
+        Vendor.objects.create(name='Acme', user=user)
+        PhysicalProduct.objects.create(
+            name='Hammer',
+            price='9.99',
+            stock=1,
+            category=Category.objects.create(name='Tools'),
+            vendor=user,
+        )
+        self.client.force_login(user)
+
+    def test_renders_msgpack_when_asked_for(self):
+        response = self.client.get(
+            '/api/physicalproducts/', HTTP_ACCEPT='application/msgpack'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        [product] = msgpack.unpackb(response.content)
+        self.assertEqual(product['name'], 'Hammer')
+        self.assertEqual(product['price'], '9.99')
+
+    def test_malformed_msgpack_body_is_a_bad_request(self):
+        response = self.client.post(
+            '/api/physicalproducts/',
+            data=b'\xc1',
+            content_type='application/msgpack',
+            HTTP_ACCEPT='application/json',
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('MessagePack parse error', response.json()['detail'])
+
+
+@override_settings(GZIP_MIN_LENGTH=1024)
+class ThresholdGZipMiddlewareTests(TestCase):
+    def respond(self, response):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        return ThresholdGZipMiddleware(lambda request: response)(request)
+
+    def test_compresses_large_responses(self):
+        response = self.respond(HttpResponse('x' * 1024))
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_leaves_small_responses_alone(self):
+        response = self.respond(HttpResponse('x' * 1023))
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, b'x' * 1023)
+
+    def test_leaves_streaming_responses_alone(self):
+        response = self.respond(StreamingHttpResponse(iter([b'x' * 4096])))
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(b''.join(response.streaming_content), b'x' * 4096)
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='acme')
+        Vendor.objects.create(name='Acme', user=user)
+        PhysicalProduct.objects.create(
+            name='Hammer',
+            description='Claw hammer',
+            price='9.99',
+            stock=1,
+            category=Category.objects.create(name='Tools'),
+            vendor=user,
+        )
+        self.client.force_login(user)
+
+    def test_selects_only_the_requested_columns(self):
+        table = PhysicalProduct._meta.db_table
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/physicalproducts/?fields=name,price')
+
+        self.assertEqual(response.json(), [{'name': 'Hammer', 'price': '9.99'}])
+        [select] = [
+            query['sql']
+            for query in queries
+            if query['sql'].startswith('SELECT') and f'FROM "{table}"' in query['sql']
+        ]
+        columns = select[len('SELECT '):select.index(' FROM ')]
+        self.assertEqual(
+            columns,
+            f'"{table}"."id", "{table}"."name", "{table}"."price"',
+        )
+
+    def test_unknown_field_is_a_bad_request(self):
+        response = self.client.get('/api/physicalproducts/?fields=name,secret')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('secret', response.json()['fields'])
+
+    def test_write_methods_ignore_fields(self):
+        # A narrowed serializer would only validate `name`.
+        response = self.client.post(
+            '/api/physicalproducts/?fields=name,unknown',
+            data={'name': 'Saw'},
+            content_type='application/json',
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()), {'price', 'stock'})
+
+
+class AdminSearchTests(TestCase):
+    def setUp(self):
+        admin = User.objects.create_superuser(username='admin')
+        self.client.force_login(admin)
+        for name in ('Acme', 'Globex'):
+            user = User.objects.create_user(username=name.lower())
+            Vendor.objects.create(name=name, user=user)
+        self.order = Order.objects.create(user=admin)
+        Order.objects.create(user=admin)
+
+    def search(self, model, term):
+        response = self.client.get(f'/admin/core/{model}/', {'q': term})
+        self.assertEqual(response.status_code, 200)
+        return list(response.context['cl'].result_list)
+
+    def test_vendor_search_matches_name_prefixes(self):
+        with CaptureQueriesContext(connection) as queries:
+            vendors = self.search('vendor', 'Ac')
+
+        self.assertEqual([vendor.name for vendor in vendors], ['Acme'])
+        self.assertFalse(any("'%Ac" in query['sql'] for query in queries))
+        self.assertEqual(self.search('vendor', 'cme'), [])
+
+    def test_order_search_looks_up_the_uuid(self):
+        self.assertEqual(self.search('order', str(self.order.order_id)), [self.order])
+        self.assertEqual(self.search('order', 'not-a-uuid'), [])
+        self.assertEqual(len(self.search('order', '')), 2)
+
+
+class RekeyOrdersTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='buyer')
+        product = PhysicalProduct.objects.create(
+            name='Hammer',
+            price='9.99',
+            stock=1,
+            category=Category.objects.create(name='Tools'),
+            vendor=user,
+        )
+        for day in (1, 2):
+            order = Order.objects.create(order_id=uuid.uuid4(), user=user)
+            Order.objects.filter(pk=order.pk).update(
+                created_at=timezone.make_aware(datetime(2026, 1, day))
+            )
+            PhysicalOrderItem.objects.create(
+                order=order, physical_product=product, quantity=day
+            )
+
+    def test_uuid7_at_encodes_the_moment(self):
+        moment = timezone.make_aware(datetime(2026, 1, 2, 3, 4, 5))
+        value = uuid7_at(moment)
+
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, uuid.RFC_4122)
+        self.assertEqual(value.int >> 80, int(moment.timestamp() * 1000))
+        self.assertLess(value, uuid7_at(moment + timedelta(milliseconds=1)))
+
+    def test_rekeys_orders_and_their_items(self):
+        out = StringIO()
+        call_command('rekey_orders', '--batch-size=1', stdout=out)
+
+        self.assertIn('Successfully re-keyed 2 orders', out.getvalue())
+        orders = list(Order.objects.order_by('created_at'))
+        self.assertEqual([order.order_id.version for order in orders], [7, 7])
+        self.assertLess(orders[0].order_id, orders[1].order_id)
+        quantities = {
+            item.order_id: item.quantity for item in PhysicalOrderItem.objects.all()
+        }
+        self.assertEqual(quantities, {orders[0].pk: 1, orders[1].pk: 2})
+
+    def test_dry_run_changes_nothing(self):
+        before = set(Order.objects.values_list('order_id', flat=True))
+        out = StringIO()
+        call_command('rekey_orders', '--dry-run', stdout=out)
+
+        self.assertIn('Dry run: would re-key 2 orders', out.getvalue())
+        self.assertNotIn('Re-keyed', out.getvalue())
+        self.assertEqual(set(Order.objects.values_list('order_id', flat=True)), before)
+
+
+class WarmupTests(TestCase):
+    def test_fills_model_meta_caches(self):
+        fill_model_meta()
+
+        for model in apps.get_models():
+            with self.subTest(model=model.__name__):
+                self.assertIn('fields_map', model._meta.__dict__)
+                self.assertIn('_forward_fields_map', model._meta.__dict__)
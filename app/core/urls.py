@@ -14,5 +14,6 @@ router.register(
 urlpatterns = [
     path('', views.index, name='index'),
     path('secret/', views.secret, name='secret'),
+    path('api/changes/', views.ProductChangesView.as_view(), name='product-changes'),
     path('api/', include(router.urls)),
 ]
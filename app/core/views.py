@@ -1,7 +1,20 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, Q
 from django.shortcuts import render
-from rest_framework import viewsets
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from rest_framework import permissions, serializers, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from core.models import DigitalProduct, PhysicalProduct
+from core.models import DigitalProduct, PhysicalProduct, ProductDeletion
 from core.permissions import IsVendorOrReadOnly
 from core.serializers import DigitalProductSerializer, PhysicalProductSerializer
 
@@ -19,13 +32,237 @@ def secret(request):
 
 
 # API
-class PhysicalProductViewSet(viewsets.ModelViewSet):
+class BatchLookupMixin:
+    """
+    Adds a `batch` list action that fetches up to `batch_max_size` objects
+    by `?ids=1,2,3` or `?slugs=a,b,c` with a single `IN` query.
+    `results` maps each key that was found to the list of its objects, in
+    the order the keys were asked for, and unknown keys are reported under
+    `missing`. Slugs are only unique within a category, so a slug lists
+    every product that has it, ordered by id.
+    """
+
+    batch_max_size = 100
+
+    @action(detail=False, url_path='batch')
+    def batch(self, request):
+        ids = request.query_params.get('ids')
+        slugs = request.query_params.get('slugs')
+        if (ids is None) == (slugs is None):
+            raise serializers.ValidationError('Pass exactly one of ids or slugs')
+
+        field, raw = ('pk', ids) if ids is not None else ('slug', slugs)
+        keys = list(dict.fromkeys(key.strip() for key in raw.split(',') if key.strip()))
+        if len(keys) > self.batch_max_size:
+            raise serializers.ValidationError(
+                f'Cannot fetch more than {self.batch_max_size} objects at once'
+            )
+        if field == 'pk':
+            try:
+                keys = list(dict.fromkeys(int(key) for key in keys))
+            except ValueError:
+                raise serializers.ValidationError({'ids': 'Must be integers'})
+
+        # Read the key through an annotation so it is loaded even when the
+        # queryset defers the column.
+        queryset = self.filter_queryset(self.get_queryset())
+        found = defaultdict(list)
+        for obj in (
+            queryset.filter(**{f'{field}__in': keys})
+            .annotate(batch_key=F(field))
+            .order_by('pk')
+        ):
+            found[obj.batch_key].append(obj)
+        found_keys = [key for key in keys if key in found]
+        data = iter(
+            self.get_serializer(
+                [obj for key in found_keys for obj in found[key]], many=True
+            ).data
+        )
+        return Response(
+            {
+                'results': {
+                    key: [next(data) for _ in found[key]] for key in found_keys
+                },
+                'missing': [key for key in keys if key not in found],
+            }
+        )
+
+
+class SparseFieldsetMixin:
+    """
+    Lets read requests name the serializer fields they need with
+    `?fields=name,price`. Only those fields are serialized and, when they
+    all map to model columns, only those columns are selected.
+    """
+
+    @cached_property
+    def requested_fields(self):
+        raw = self.request.query_params.get('fields')
+        if not raw or self.request.method not in permissions.SAFE_METHODS:
+            return None
+        requested = list(dict.fromkeys(f.strip() for f in raw.split(',') if f.strip()))
+        allowed = self.get_serializer_class().Meta.fields
+        unknown = [name for name in requested if name not in allowed]
+        if unknown:
+            raise serializers.ValidationError(
+                {'fields': f'Unknown fields: {", ".join(unknown)}'}
+            )
+        return requested
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.requested_fields is None:
+            return queryset
+        declared = self.get_serializer_class()().fields
+        sources = [declared[name].source for name in self.requested_fields]
+        try:
+            for source in sources:
+                queryset.model._meta.get_field(source)
+        except FieldDoesNotExist:
+            # Computed fields may read any column, so select them all.
+            return queryset
+        return queryset.only(*sources)
+
+    def get_serializer(self, *args, **kwargs):
+        if self.requested_fields is not None:
+            kwargs.setdefault('fields', self.requested_fields)
+        return super().get_serializer(*args, **kwargs)
+
+
+class PhysicalProductViewSet(
+    SparseFieldsetMixin, BatchLookupMixin, viewsets.ModelViewSet
+):
     queryset = PhysicalProduct.objects.all()
     serializer_class = PhysicalProductSerializer
     permission_classes = [IsVendorOrReadOnly]
 
 
-class DigitalProductViewSet(viewsets.ModelViewSet):
+class DigitalProductViewSet(
+    SparseFieldsetMixin, BatchLookupMixin, viewsets.ModelViewSet
+):
     queryset = DigitalProduct.objects.all()
     serializer_class = DigitalProductSerializer
     permission_classes = [IsVendorOrReadOnly]
+
+
+class ProductChangesView(APIView):
+    """
+    Feed of products changed or deleted since an opaque resume cursor.
+
+    Each product table and the deletion log is read in (timestamp, id) order
+    from its own position in the cursor, so a sync costs as much as the
+    number of changes rather than the size of the catalog.
+    """
+
+    default_limit = 100
+    max_limit = 1000
+    cursor_salt = 'core.views.ProductChangesView'
+    sources = {
+        ProductDeletion.ProductTypeChoices.PHYSICAL: (
+            PhysicalProduct,
+            PhysicalProductSerializer,
+        ),
+        ProductDeletion.ProductTypeChoices.DIGITAL: (
+            DigitalProduct,
+            DigitalProductSerializer,
+        ),
+    }
+
+    def get(self, request):
+        limit = self.get_limit(request)
+        positions = self.decode_cursor(request.query_params.get('cursor'))
+        # Rows stamped just before a slow transaction commits show up after
+        # later ones, so only changes older than any open write are handed out.
+        settled = timezone.now() - timedelta(seconds=settings.CHANGES_SETTLE_SECONDS)
+
+        changes = []
+        for product_type, (model, serializer_class) in self.sources.items():
+            products = (
+                model.objects.filter(
+                    self.after(positions.get(product_type), 'updated_at'),
+                    updated_at__lt=settled,
+                )
+                .order_by('updated_at', 'id')[: limit + 1]
+            )
+            changes += [
+                (
+                    product.updated_at,
+                    product_type,
+                    product.pk,
+                    {
+                        'type': product_type,
+                        'id': product.pk,
+                        'slug': product.slug,
+                        'updated_at': product.updated_at,
+                        'deleted': False,
+                        'data': serializer_class(product).data,
+                    },
+                )
+                for product in products
+            ]
+
+        deletions = (
+            ProductDeletion.objects.filter(
+                self.after(positions.get('deleted'), 'deleted_at'),
+                deleted_at__lt=settled,
+            )
+            .order_by('deleted_at', 'id')[: limit + 1]
+        )
+        changes += [
+            (
+                deletion.deleted_at,
+                'deleted',
+                deletion.pk,
+                {
+                    'type': deletion.product_type,
+                    'id': deletion.product_id,
+                    'slug': deletion.slug,
+                    'updated_at': deletion.deleted_at,
+                    'deleted': True,
+                    'data': None,
+                },
+            )
+            for deletion in deletions
+        ]
+
+        changes.sort(key=lambda change: change[:3])
+        page = changes[:limit]
+        for timestamp, stream, pk, _ in page:
+            positions[stream] = [timestamp.isoformat(), pk]
+
+        return Response(
+            {
+                'results': [change for *_, change in page],
+                'cursor': signing.dumps(positions, salt=self.cursor_salt),
+                'has_more': len(changes) > limit,
+            }
+        )
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            raise serializers.ValidationError({'limit': 'Must be an integer'})
+        return max(1, min(limit, self.max_limit))
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return {}
+        try:
+            return signing.loads(cursor, salt=self.cursor_salt)
+        except signing.BadSignature:
+            raise serializers.ValidationError({'cursor': 'Invalid cursor'})
+
+    def after(self, position, field):
+        """
+        Rows strictly after a (timestamp, id) position.
+        """
+        if position is None:
+            return Q()
+        timestamp, pk = parse_datetime(position[0]), position[1]
+        # The redundant lower bound lets the (field, id) index range-scan
+        # instead of evaluating the OR for every row.
+        return Q(**{f'{field}__gte': timestamp}) & (
+            Q(**{f'{field}__gt': timestamp}) | Q(**{field: timestamp, 'id__gt': pk})
+        )
@@ -0,0 +1,37 @@
+import signal
+import threading
+
+
+def run_worker_process(index, stop, results, poll_interval=1.0, burst=False):
+    """
+    Entry point for `run_workers --mode process`.
+
+    Under the spawn and forkserver start methods the child imports this
+    module before Django is set up, so models may only be imported after
+    `django.setup()`. The parent handles Ctrl-C and signals shutdown through
+    `stop`, so an interrupt never lands mid-job.
+    """
+    import django
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    django.setup()
+
+    from core import jobs
+
+    jobs.run_worker(index, stop, results, poll_interval, burst)
+
+
+class WorkerThread(threading.Thread):
+    """
+    Thread for `run_workers --mode thread` that keeps the exception it died
+    with, so the command can report it like a process exit code.
+    """
+
+    error = None
+
+    def run(self):
+        try:
+            super().run()
+        except BaseException as e:
+            self.error = e
+            raise
@@ -4,4 +4,4 @@ echo $'\nRunning in Production...\n'
 
 python3 manage.py collectstatic --noinput
 python3 manage.py migrate --noinput
-python3 -m gunicorn --bind 0.0.0.0:8000 --workers 3 config.wsgi:application
+python3 -m gunicorn --config gunicorn.conf.py config.wsgi:application
@@ -0,0 +1,12 @@
+bind = '0.0.0.0:8000'
+workers = 3
+
+# Load the application in the master so the warmup below is shared with
+# every worker copy-on-write.
+preload_app = True
+
+
+def when_ready(server):
+    from config.warmup import warmup
+
+    warmup()